@@ -33,84 +33,302 @@ getting CPU information, and the memory layout of the device. Data will be parse
 data structures as needed. Allows us to handle different XML formats for device info, like
 Microchip's previous EDC file format.
 
-This class uses the default XML parsers in Python, which are vulnerable to certain attacks
-relying on XML entities referecing other entities multiple times. Specifically, the attacks are
-called "Billion Laughs" and "Quadratic Blowup". Therefore, you should ensure that the packs files
-you give to this module are really from Microchip and not some malicious user. See the info here:
-https://docs.python.org/3/library/xml.html#module-xml. That page has a link to a package called
-"defusedxml" you can use if you want to be safer. You should just need to get it from PIP and
-update the import statement for ElementTree below and in other modules to use it.
+This class will use lxml to parse the files if it is installed because it is quite a bit faster
+than the parser that comes with Python. The lxml parser is set up to not resolve entities or access
+the network. If lxml is not installed, then this falls back to the default XML parsers in Python,
+which are vulnerable to certain attacks relying on XML entities referecing other entities multiple
+times. Specifically, the attacks are called "Billion Laughs" and "Quadratic Blowup". Therefore, you
+should ensure that the packs files you give to this module are really from Microchip and not some
+malicious user. See the info here: https://docs.python.org/3/library/xml.html#module-xml. That page
+has a link to a package called "defusedxml" you can use if you want to be safer. You should just
+need to get it from PIP and update the import statement for ElementTree below to use it.
 '''
 
 # On another note, I'm using this class to try out the Python type hints. I don't know what I'm
 # doing, so I'm using the cheat sheet here for help: 
 # https://mypy.readthedocs.io/en/stable/cheat_sheet_py3.html
 
+from __future__ import annotations
 
 from device_info import *
+import device_info
+import functools
+import hashlib
+import multiprocessing
+import os
 from pathlib import Path
-import re
-import xml.etree.ElementTree as ET
-from xml.etree.ElementTree import Element
+import pickle
+import sys
+from typing import TYPE_CHECKING
+
+# Prefer lxml because its parser is written in C and is a lot faster on the big ATDF files. Its
+# API is compatible with the ElementTree stuff we use, so fall back to that if lxml is missing.
+try:
+    from lxml import etree as ET
+    _using_lxml: bool = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _using_lxml = False
+
+# Element is used only in type hints, which are not evaluated at runtime thanks to the "annotations"
+# import above. The lxml elements have the same interface as these as far as this module cares.
+if TYPE_CHECKING:
+    from xml.etree.ElementTree import Element
+
+
+# Strings that get_bool() will treat as true. XML allows "1" as well as "true" for Booleans.
+_TRUE_STRINGS: frozenset[str] = frozenset(('true', 'True', 'TRUE', '1'))
+
+
+def _parse_int(attr: str | None, default: int = 0) -> int:
+    '''Convert the text of an integer attribute to an int or return the default if it is None.
+
+    The register parsing code reads the attributes of each element directly and calls this so it
+    does not need to go through the element again.
+    '''
+    if attr is None:
+        return default
+
+    # Nearly all values are hex with a "0x" prefix or plain decimal, so handle those directly
+    # and let int() figure out the base of anything else.
+    if attr[:2] in ('0x', '0X'):
+        return int(attr, 16)
+
+    try:
+        return int(attr)
+    except ValueError:
+        return int(attr, 0)
+
+
+@functools.cache
+def _get_cache_version() -> str:
+    '''Return a string identifying the version of the code that makes the DeviceInfo structures
+    saved in the cache directory.
+
+    This is a hash of the source of this module and of device_info.py, so any change to either one,
+    like adding a member to one of the structures, means that entries saved before the change are
+    never found again.
+    '''
+    version_hash = hashlib.blake2b(digest_size=8)
+
+    for module_path in (__file__, device_info.__file__):
+        with open(module_path, 'rb') as module_file:
+            version_hash.update(module_file.read())
+
+    return version_hash.hexdigest()
+
+
+# These are the guts of the AtdfReader.get_*() methods. They are module-level functions so that
+# calling them from the methods below does not need to look them up on the class each time.
+def _get_str(e: Element, name: str, default: str = '') -> str:
+    return e.get(name, default)
+
+
+def _get_int(e: Element, name: str, default: int = 0) -> int:
+    return _parse_int(e.get(name), default)
+
+
+def _get_bool(e: Element, name: str, default: bool = False) -> bool:
+    attr: str | None = e.get(name)
+    if attr is not None:
+        return attr in _TRUE_STRINGS
+    else:
+        return default
+
+
+def _get_parameter_value(e: Element) -> ParameterValue:
+    '''Make a ParameterValue from the 'name', 'value', and 'caption' attributes of the given
+    element.
+
+    Device parameters, device properties, and instance parameters all look like this.
+    '''
+    attrs = e.attrib
+    return ParameterValue(attrs.get('name', ''), attrs.get('value', ''), attrs.get('caption', ''))
+
+
+def _get_device_interrupt(e: Element) -> DeviceInterrupt:
+    '''Make a DeviceInterrupt from the attributes of the given "interrupt" element.
+    '''
+    attrs = e.attrib
+    return DeviceInterrupt(attrs.get('name', ''),
+                           _parse_int(attrs.get('index')),
+                           sys.intern(attrs.get('module-instance', '')),
+                           attrs.get('caption', ''))
+
+
+def _get_device_event(e: Element) -> DeviceEvent:
+    '''Make a DeviceEvent from the attributes of the given event "generator" or "user" element.
+    '''
+    attrs = e.attrib
+    return DeviceEvent(attrs.get('name', ''),
+                       _parse_int(attrs.get('index')),
+                       sys.intern(attrs.get('module-instance', '')))
+
+
+def _get_memory_region(e: Element) -> DeviceMemoryRegion:
+    '''Make a DeviceMemoryRegion from the attributes of the given "memory-segment" element.
+    '''
+    attrs = e.attrib
+    return DeviceMemoryRegion(attrs.get('name', ''),
+                              _parse_int(attrs.get('start')),
+                              _parse_int(attrs.get('size')),
+                              sys.intern(attrs.get('type', '')),
+                              _parse_int(attrs.get('pagesize')),
+                              attrs.get('external') in _TRUE_STRINGS)
 
 
 class AtdfReader:
+    '''Reads device info out of an ATDF file.
+
+    The lists of things like peripherals and interrupts are built the first time they are asked for
+    and then saved, so asking again is cheap. This means that the same lists are returned each time,
+    so treat them as read-only.
+    '''
+
     # These are relative to the root element, which points to the top-level node
     # "avr-tools-device-file".
     variants_path: str = 'variants'
     device_path: str = 'devices/device'
     modules_path: str = 'modules'
 
+    # These are the top-level sections of the file this class actually reads. The contents of any
+    # others, like the "pinouts" section, are thrown away while parsing to save memory.
+    used_sections: tuple[str, ...] = ('variants', 'devices', 'modules')
+
+    # Devices need at least this many peripherals for parsing them in parallel to be worth starting
+    # up the worker processes. This matters only when the 'parallel' option is used.
+    parallel_min_peripherals: int = 8
+
 
-    def __init__(self, atdf_path: Path) -> None:
+    def __init__(self, atdf_path: Path, parallel: bool = False, cache_dir: Path | None = None) -> None:
         '''Create a new AtdfReader class instance with the given file assuming it is a valid ATDF
         file.
 
         This does not check that the file is really an ATDF file, but if not then many of the
         methods in this class simply will not work properly. Like the main comment in this file
         says, you need to ensure that the files you are giving this class are really from Microhip.
+
+        Set 'parallel' to True to parse the peripherals of big devices using a pool of processes,
+        one per CPU. This is off by default because it cannot be used if this is already running in
+        a worker process, like when the main app parses many files at once. The main app never uses
+        this option. The pool is also skipped if there is only one CPU or the number of CPUs is not
+        known, because then the processes would only slow things down.
+
+        Set 'cache_dir' to a directory in which to save the DeviceInfo returned by
+        'get_all_device_info()'. If the saved info is still up-to-date the next time this file is
+        read, then it is loaded from there instead of parsing the file again. The saved info is
+        loaded using the pickle module, so the cache directory must be one that only you can modify.
         '''
         self.path: Path = atdf_path
-        self.tree = ET.parse(self.path)
-        self.root: Element = self.tree.getroot()
+        self.parallel: bool = parallel
+
+        # Maps a starting element and subelement tag to a dict of those subelements by their 'name'
+        # attributes. This is filled in as needed by _find_element_with_name_attr().
+        self._name_index: dict[tuple[Element, str], dict[str, Element]] = {}
+
+        self.cache_path: Path | None = None
+        self._cached_device_info: DeviceInfo | None = None
+
+        if cache_dir is not None:
+            self.cache_path = cache_dir / (self._get_cache_key() + '.pickle')
+            self._cached_device_info = self._load_cached_device_info()
+
+
+    @classmethod
+    def for_path(cls, atdf_path: Path | str) -> AtdfReader:
+        '''Return a reader for the given file, reusing the one made by an earlier call with the
+        same file if there was one.
+
+        Use this when the same file is needed more than once so that it is parsed only once. The
+        path is made absolute first, so different ways of naming the same file share one reader.
+        The readers returned by this are shared, so treat them as read-only like the lists they
+        return. They also will not see changes made to the file after they were created.
+
+        The readers are made with the default arguments, so they do not use the 'parallel' or
+        'cache_dir' options. Create an AtdfReader directly if you need those. Each saved reader
+        keeps its parsed file and everything read from it in memory until it is pushed out by
+        newer ones, so only the few most recently used readers are kept.
+        '''
+        return cls._for_resolved_path(Path(atdf_path).resolve())
+
+
+    @classmethod
+    @functools.lru_cache(maxsize=8)
+    def _for_resolved_path(cls, atdf_path: Path) -> AtdfReader:
+        '''Return a reader for the given absolute path. This does the actual work for 'for_path()'.
+        '''
+        return cls(atdf_path)
+
+
+    @functools.cached_property
+    def root(self) -> Element:
+        '''The root element of the file.
+
+        The file is not parsed until this is first needed, so nothing is parsed at all if the
+        device info can be loaded from the cache instead.
+        '''
+        return self._parse_used_sections()
+
+
+    # Find these once so the methods below do not have to keep searching from the root.
+    @functools.cached_property
+    def _device(self) -> Element | None:
+        return self.root.find(AtdfReader.device_path)
+
+    @functools.cached_property
+    def _variants(self) -> Element | None:
+        return self.root.find(AtdfReader.variants_path)
+
+    @functools.cached_property
+    def _modules(self) -> Element | None:
+        return self.root.find(AtdfReader.modules_path)
+
+
+    @functools.cached_property
+    def _device_sections(self) -> dict[str, Element]:
+        '''The sections of the device element, like "address-spaces" and "interrupts", by their
+        tags. These are collected in a single pass so the getters can go right to the one they need.
+        '''
+        sections: dict[str, Element] = {}
+
+        if self._device is not None:
+            for section in self._device:
+                sections.setdefault(section.tag, section)
+
+        return sections
 
 
     @staticmethod
     def get_str(e: Element, name: str, default: str = '') -> str:
         '''A convenience method for reading a string attribute with a configurable defualt.
         '''
-        return e.get(name, default)
+        return _get_str(e, name, default)
 
 
     @staticmethod
     def get_int(e: Element, name: str, default: int = 0) -> int:
         '''A convenience method for reading an integer attribute with a configurable default.
         '''
-        attr: str | None = e.get(name)
-        if attr is not None:
-            return int(attr, 0)     # last 0 tells int() to figure out base automatically
-        else:
-            return default
+        return _get_int(e, name, default)
 
 
     @staticmethod
     def get_bool(e: Element, name: str, default: bool = False) -> bool:
         '''A convenience method for reading a Boolean attribute with a configurable default.
         '''
-        attr: str | None = e.get(name)
-        if attr is not None:
-            if 'true' == attr.lower():
-                return True
-            else:
-                return False
-        else:
-            return default
+        return _get_bool(e, name, default)
 
 
     def get_all_device_info(self) -> DeviceInfo:
         '''Return a DeviceInfo structure with all of the info from below functions added to it.
+
+        If this reader was given a cache directory, then this will return the saved info if it is
+        still up-to-date and will otherwise save the info it creates there.
         '''
-        return DeviceInfo(name = self.get_device_name(),
+        if self._cached_device_info is not None:
+            return self._cached_device_info
+
+        devinfo = DeviceInfo(name = self.get_device_name(),
                           cpu = self.get_device_cpu(),
                           family = self.get_device_family(),
                           series = self.get_device_series(),
@@ -123,18 +341,37 @@ class AtdfReader:
                           event_generators = self.get_event_generators(),
                           event_users = self.get_event_users())
 
+        if self.cache_path is not None:
+            self._save_cached_device_info(devinfo)
+
+        return devinfo
+
+
+    def is_cached(self) -> bool:
+        '''Return True if the info for this file was loaded from the cache directory, in which case
+        'get_all_device_info()' will not need to parse the file.
+        '''
+        return self._cached_device_info is not None
+
 
     def get_device_name(self) -> str:
+        '''Return the 'device_name' property. See that for more info.
+        '''
+        return self.device_name
+
+
+    @functools.cached_property
+    def device_name(self) -> str:
         '''Get the name of the device like you would see on a datasheet.
 
         This does not return the extra order codes for things like temperature rating or package
         type. This will also return "SAM..." instead 'ATSAM..." for Atmel devices. For example, you
         would get back "SAME54P20A", not "ATSAME54P20A-CTU" or "ATSAME54P20A".
         '''
-        element: Element | None = self.root.find(AtdfReader.device_path)
+        element: Element | None = self._device
 
         if element is not None:
-            name = AtdfReader.get_str(element, 'name')
+            name = _get_str(element, 'name')
             if name.upper().startswith('ATSAM'):
                 return name[2:]
             else:
@@ -144,240 +381,412 @@ class AtdfReader:
 
 
     def get_device_cpu(self) -> str:
+        '''Return the 'device_cpu' property. See that for more info.
+        '''
+        return self.device_cpu
+
+
+    @functools.cached_property
+    def device_cpu(self) -> str:
         '''Get the cpu name of the device as a lower-case string, such as "mips" or "cortex-m4".
 
         This will return an empty string if the cpu name was not found.
         '''
-        element: Element | None = self.root.find(AtdfReader.device_path)
+        element: Element | None = self._device
         
         if element is not None:
             # The tag is "architecture", but we use that to refer to ARMv7-M vs ARMv8M whereas the
             # ATDF files use that to refer to what we are calling the CPU name. Our usage matches
             # how LLVM and GCC options work.
-            return AtdfReader.get_str(element, 'architecture').lower()
+            return _get_str(element, 'architecture').lower()
         else:
             return ''
     
 
     def get_device_family(self) -> str:
+        '''Return the 'device_family' property. See that for more info.
+        '''
+        return self.device_family
+
+
+    @functools.cached_property
+    def device_family(self) -> str:
         '''Get the family of the device, such as "SAME", "PIC32CX", and so on.
 
         This will return an empty string if the family is not found.
         '''
-        element: Element | None = self.root.find(AtdfReader.device_path)
+        element: Element | None = self._device
 
         if element is not None:
-            return AtdfReader.get_str(element, 'family')
+            return _get_str(element, 'family')
         else:
             return ''
 
 
     def get_device_series(self) -> str:
+        '''Return the 'device_series' property. See that for more info.
+        '''
+        return self.device_series
+
+
+    @functools.cached_property
+    def device_series(self) -> str:
         '''Get the family of the device, such as "SAME54", "PIC32CXSG41", and so on.
 
         This will return an empty string if the family is not found.
         '''
-        element: Element | None = self.root.find(AtdfReader.device_path)
+        element: Element | None = self._device
 
         if element is not None:
-            return AtdfReader.get_str(element, 'series')
+            return _get_str(element, 'series')
         else:
             return ''
 
 
     def get_device_pincount(self) -> int:
+        '''Return the 'device_pincount' property. See that for more info.
+        '''
+        return self.device_pincount
+
+
+    @functools.cached_property
+    def device_pincount(self) -> int:
         '''Get the number of pins on the device or 0 if this info could not be found.
 
         Some devices, like the PIC32MX795F512L, are available in packages of different sizes even
         though the number of usable pins (100 in this case) remains the same. This will use the
         package with the lowest pin count to determine the number of pins.
         '''
-        element: Element | None = self.root.find(AtdfReader.variants_path)
+        element: Element | None = self._variants
 
         if element is None:
             return 0
         else:
-            min_pincount = 999999
-            for variant_element in element.findall('variant'):
-                package = AtdfReader.get_str(variant_element, 'package')
-                match = re.search(r'\d+$', package)
-
-                if match:
-                    package_pins = int(match.group())
-                    if package_pins < min_pincount:
-                        min_pincount = package_pins
-
-            if 999999 == min_pincount:
-                return 0
-            else:
-                return min_pincount
+            pincounts: list[int] = []
+            for variant_element in element.iterfind('variant'):
+                package = _get_str(variant_element, 'package')
+
+                # The pin count is at the end of the package name, like "TQFP100". Walk back from
+                # the end to find where the digits start.
+                start = len(package)
+                while start > 0  and  package[start - 1].isdecimal():
+                    start -= 1
+
+                if start < len(package):
+                    pincounts.append(int(package[start:]))
+
+            return min(pincounts, default=0)
+
+
+    def get_device_memory(self) -> tuple[DeviceAddressSpace, ...]:
+        '''Return the 'device_memory' property. See that for more info.
+        '''
+        return self.device_memory
 
 
-    def get_device_memory(self) -> list[DeviceAddressSpace]:
+    @functools.cached_property
+    def device_memory(self) -> tuple[DeviceAddressSpace, ...]:
         '''Get a list of address spaces in this device, which in turn may contain memory regions.
         '''
-        start_element: Element |None = self.root.find(AtdfReader.device_path + '/address-spaces')
+        start_element: Element | None = self._find_in_device('address-spaces')
 
         if start_element is None:
-            return []
+            return ()
 
         memories: list[DeviceAddressSpace] = []
 
-        for space_element in start_element.findall('address-space'):
-            regions: list[DeviceMemoryRegion] = []
-
-            # Get any memory segments this space.
-            for segment_element in space_element.findall('memory-segment'):
-                region = DeviceMemoryRegion(name = AtdfReader.get_str(segment_element, 'name'),
-                                            start_addr = AtdfReader.get_int(segment_element, 'start'),
-                                            size = AtdfReader.get_int(segment_element, 'size'),
-                                            type = AtdfReader.get_str(segment_element, 'type'),
-                                            page_size = AtdfReader.get_int(segment_element, 'pagesize'),
-                                            external = AtdfReader.get_bool(segment_element, 'external'))
-                regions.append(region)
+        for space_element in start_element.iterfind('address-space'):
+            # Get any memory segments in this space.
+            regions = tuple(map(_get_memory_region, space_element.iterfind('memory-segment')))
 
             # Get the address space info and add the regions we found.
-            addr_space = DeviceAddressSpace(id = AtdfReader.get_str(space_element, 'id'),
-                                            start_addr = AtdfReader.get_int(space_element, 'start'),
-                                            size = AtdfReader.get_int(space_element, 'size'),
-                                            mem_regions = regions)
-            
-            memories.append(addr_space)
+            attrs = space_element.attrib
+            memories.append(DeviceAddressSpace(sys.intern(attrs.get('id', '')),
+                                               _parse_int(attrs.get('start')),
+                                               _parse_int(attrs.get('size')),
+                                               regions))
 
-        return memories
+        return tuple(memories)
+
+
+    def get_device_parameters(self) -> tuple[ParameterValue, ...]:
+        '''Return the 'device_parameters' property. See that for more info.
+        '''
+        return self.device_parameters
 
 
-    def get_device_parameters(self) -> list[ParameterValue]:
+    @functools.cached_property
+    def device_parameters(self) -> tuple[ParameterValue, ...]:
         '''Get a list of parameters (C macros containing info) for the device itself.
         '''
-        start_element: Element | None = self.root.find(AtdfReader.device_path + '/parameters')
+        start_element: Element | None = self._find_in_device('parameters')
 
         if start_element is None:
-            return []
+            return ()
 
-        params: list[ParameterValue] = []
+        return tuple(map(_get_parameter_value, start_element.iterfind('param')))
 
-        for param_element in start_element.findall('param'):
-            pv = ParameterValue(name = AtdfReader.get_str(param_element, 'name'),
-                                value = AtdfReader.get_str(param_element, 'value'),
-                                caption = AtdfReader.get_str(param_element, 'caption'))
-            params.append(pv)
 
-        return params
+    def get_peripheral_groups(self) -> tuple[PeripheralGroup, ...]:
+        '''Return the 'peripheral_groups' property. See that for more info.
+        '''
+        return self.peripheral_groups
 
 
-    def get_peripheral_groups(self) -> list[PeripheralGroup]:
+    @functools.cached_property
+    def peripheral_groups(self) -> tuple[PeripheralGroup, ...]:
         '''Get a list of the peripheral groups for the device.
 
         Each peripheral group will contain one or more instances of the peripheral and the register
         definitions used by all of the instances.
         '''
-        start_element: Element | None = self.root.find(AtdfReader.device_path + '/peripherals')
+        start_element: Element | None = self._find_in_device('peripherals')
 
         if start_element is None:
-            return []
-
-        periph_groups: list[PeripheralGroup] = []
+            return ()
+
+        # Pair up each peripheral with the module element that defines its registers.
+        periph_modules: list[tuple[Element, Element | None]] = []
+
+        for periph_element in start_element.iterfind('module'):
+            module_name = _get_str(periph_element, 'name')
+            module_element = self._find_element_with_name_attr(self._modules, 'module', module_name)
+            periph_modules.append((periph_element, module_element))
+
+        # Starting up the worker processes only pays off if there is more than one CPU to run them
+        # and enough peripherals to keep them busy.
+        cpu_count: int = os.cpu_count() or 1
+        use_pool: bool = (self.parallel  and  cpu_count > 1  and
+                          len(periph_modules) >= AtdfReader.parallel_min_peripherals)
+
+        if use_pool:
+            # The worker processes cannot share our elements, so give them the XML text of each
+            # peripheral and module to parse on their own.
+            periph_xml: list[tuple[bytes, bytes | None]] = []
+            for periph_element, module_element in periph_modules:
+                module_xml = ET.tostring(module_element) if module_element is not None else None
+                periph_xml.append((ET.tostring(periph_element), module_xml))
+
+            with multiprocessing.Pool(processes=cpu_count) as pool:
+                return tuple(pool.map(_get_peripheral_group_from_xml, periph_xml))
+        else:
+            return tuple(AtdfReader._get_peripheral_group(periph_element, module_element)
+                         for periph_element, module_element in periph_modules)
 
-        for module_element in start_element.findall('module'):
-            module_name = AtdfReader.get_str(module_element, 'name')
-            group = PeripheralGroup(name = module_name,
-                                    id = AtdfReader.get_str(module_element, 'id'),
-                                    version = AtdfReader.get_str(module_element, 'version'),
-                                    instances = self._get_peripheral_instances(module_element),
-                                    reg_groups = self._get_register_groups(module_name))
-            periph_groups.append(group)
 
-        return periph_groups
+    def get_interrupts(self) -> tuple[DeviceInterrupt, ...]:
+        '''Return the 'interrupts' property. See that for more info.
+        '''
+        return self.interrupts
 
 
-    def get_interrupts(self) -> list[DeviceInterrupt]:
+    @functools.cached_property
+    def interrupts(self) -> tuple[DeviceInterrupt, ...]:
         '''Get a list of all interrupts on the device.
         '''
-        start_element: Element | None = self.root.find(AtdfReader.device_path + '/interrupts')
+        start_element: Element | None = self._find_in_device('interrupts')
 
         if start_element is None:
-            return []
+            return ()
 
-        interrupt_list: list[DeviceInterrupt] = []
+        return tuple(map(_get_device_interrupt, start_element.iterfind('interrupt')))
 
-        for interrupt_element in start_element.findall('interrupt'):
-            di = DeviceInterrupt(name = AtdfReader.get_str(interrupt_element, 'name'),
-                                 index = AtdfReader.get_int(interrupt_element, 'index'),
-                                 module_instance = AtdfReader.get_str(interrupt_element, 'module-instance'),
-                                 caption = AtdfReader.get_str(interrupt_element, 'caption'))
-            interrupt_list.append(di)
 
-        return interrupt_list
+    def get_event_generators(self) -> tuple[DeviceEvent, ...]:
+        '''Return the 'event_generators' property. See that for more info.
+        '''
+        return self.event_generators
 
 
-    def get_event_generators(self) -> list[DeviceEvent]:
+    @functools.cached_property
+    def event_generators(self) -> tuple[DeviceEvent, ...]:
         '''Get a list of event generators on the device.
         '''
-        start_element: Element | None = self.root.find(AtdfReader.device_path + '/events/generators')
+        start_element: Element | None = self._find_in_device('events/generators')
 
         if start_element is None:
-            return []
+            return ()
 
-        events_list: list[DeviceEvent] = []
+        return tuple(map(_get_device_event, start_element.iterfind('generator')))
 
-        for event_element in start_element.findall('generator'):
-            de = DeviceEvent(name = AtdfReader.get_str(event_element, 'name'),
-                             index = AtdfReader.get_int(event_element, 'index'),
-                             module_instance = AtdfReader.get_str(event_element, 'module_instance'))
-            events_list.append(de)
-        
-        return events_list
+
+    def get_event_users(self) -> tuple[DeviceEvent, ...]:
+        '''Return the 'event_users' property. See that for more info.
+        '''
+        return self.event_users
 
 
-    def get_event_users(self) -> list[DeviceEvent]:
+    @functools.cached_property
+    def event_users(self) -> tuple[DeviceEvent, ...]:
         '''Get a list of event users on the device.
         '''
-        start_element: Element | None = self.root.find(AtdfReader.device_path + '/events/users')
+        start_element: Element | None = self._find_in_device('events/users')
 
         if start_element is None:
-            return []
+            return ()
 
-        events_list: list[DeviceEvent] = []
+        return tuple(map(_get_device_event, start_element.iterfind('user')))
 
-        for event_element in start_element.findall('user'):
-            de = DeviceEvent(name = AtdfReader.get_str(event_element, 'name'),
-                             index = AtdfReader.get_int(event_element, 'index'),
-                             module_instance = AtdfReader.get_str(event_element, 'module_instance'))
-            events_list.append(de)
-        
-        return events_list
+
+    def get_device_propertes(self) -> tuple[PropertyGroup, ...]:
+        '''Return the 'device_properties' property. See that for more info.
+        '''
+        return self.device_properties
 
 
-    def get_device_propertes(self) -> list[PropertyGroup]:
+    @functools.cached_property
+    def device_properties(self) -> tuple[PropertyGroup, ...]:
         '''Get a list of property groups for the device.
 
         These are similar to device parameters like you would get with get_device_parameters(), but
         are listed separately and in groups in the XML file for some reason.
         '''
-        start_element: Element | None = self.root.find(AtdfReader.device_path + '/property-groups')
+        start_element: Element | None = self._find_in_device('property-groups')
 
         if start_element is None:
-            return []
+            return ()
 
         propgroups: list[PropertyGroup] = []
 
-        for propgroup_element in start_element.findall('property-group'):
-            group_name = AtdfReader.get_str(propgroup_element, 'name')
-            group_props: list[ParameterValue] = []
+        for propgroup_element in start_element.iterfind('property-group'):
+            group_name = _get_str(propgroup_element, 'name')
+            group_props = tuple(map(_get_parameter_value, propgroup_element.iterfind('property')))
 
-            for prop_element in propgroup_element.findall('property'):
-                pv = ParameterValue(name = AtdfReader.get_str(prop_element, 'name'),
-                                    value = AtdfReader.get_str(prop_element, 'value'),
-                                    caption = AtdfReader.get_str(prop_element, 'caption'))
-                group_props.append(pv)
-            
             propgroups.append(PropertyGroup(name = group_name, properties = group_props))
         
-        return propgroups
+        return tuple(propgroups)
+
+
+    def _get_cache_key(self) -> str:
+        '''Return a string that identifies the current version of this reader's file.
+
+        The key changes whenever the file is modified or this app is changed in a way that could
+        change the saved info, so a cache entry using an old key will just never be found again.
+        '''
+        stat = os.stat(self.path)
+        key = f'{os.path.abspath(self.path)}:{stat.st_mtime_ns}:{stat.st_size}:{_get_cache_version()}'
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=20).hexdigest()
+
+
+    def _load_cached_device_info(self) -> DeviceInfo | None:
+        '''Return the DeviceInfo saved in this reader's cache file or None if it could not be
+        loaded.
+        '''
+        if self.cache_path is None  or  not self.cache_path.is_file():
+            return None
+
+        try:
+            with open(self.cache_path, 'rb') as cache_file:
+                devinfo = pickle.load(cache_file)
+        except Exception:
+            # The file could be damaged or unreadable. Either way, just parse the file again and
+            # replace it.
+            return None
+
+        if not isinstance(devinfo, DeviceInfo):
+            return None
+
+        return devinfo
+
+
+    def _save_cached_device_info(self, devinfo: DeviceInfo) -> None:
+        '''Save the given DeviceInfo to this reader's cache file.
+
+        The info is written to a temporary file first and then moved into place so that other
+        processes never see a partially-written file. The cache is only there to save time, so the
+        info is just not saved if this fails, such as when the cache directory is read-only or full.
+        '''
+        if self.cache_path is None:
+            return
+
+        temp_path = self.cache_path.with_name(f'{self.cache_path.name}.{os.getpid()}.tmp')
+
+        try:
+            os.makedirs(self.cache_path.parent, exist_ok = True)
 
+            with open(temp_path, 'wb') as cache_file:
+                pickle.dump(devinfo, cache_file, pickle.HIGHEST_PROTOCOL)
 
-    def _get_peripheral_instances(self, module_element: Element) -> list[PeripheralInstance]:
+            os.replace(temp_path, self.cache_path)
+        except (OSError, pickle.PicklingError):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
+    def _find_in_device(self, path: str) -> Element | None:
+        '''Return the first element matching the given path relative to the device element or None
+        if the element could not be found.
+
+        The first part of the path is the name of a section of the device element, which is looked
+        up directly instead of being searched for.
+        '''
+        section_name, _, subpath = path.partition('/')
+        section: Element | None = self._device_sections.get(section_name)
+
+        if section is None  or  not subpath:
+            return section
+
+        return section.find(subpath)
+
+
+    def _parse_used_sections(self) -> Element:
+        '''Parse the file and return its root element.
+
+        This streams through the file and clears out each top-level section not listed in
+        'used_sections' as soon as it is done being parsed, so only the parts of the file we will
+        actually read are kept in memory.
+
+        This is a private method and is called only when the 'root' property is first read.
+        '''
+        if _using_lxml:
+            # Do not expand entities or grab anything off the network to avoid the XML attacks
+            # mentioned in the main comment. Also drop comments and the whitespace between elements
+            # because we never read those. The ElementTree parser already skips comments.
+            context = ET.iterparse(str(self.path), events=('start', 'end'),
+                                   resolve_entities=False, huge_tree=False, no_network=True,
+                                   remove_comments=True, remove_blank_text=True)
+        else:
+            context = ET.iterparse(self.path, events=('start', 'end'))
+
+        root: Element | None = None
+        depth: int = 0
+
+        for event, element in context:
+            if 'start' == event:
+                if root is None:
+                    root = element
+                depth += 1
+            else:
+                depth -= 1
+                if 1 == depth  and  element.tag not in AtdfReader.used_sections:
+                    element.clear()
+
+        if root is None:
+            raise RuntimeError(f'File {self.path} does not contain any XML elements.')
+
+        return root
+
+
+    @staticmethod
+    def _get_peripheral_group(periph_element: Element,
+                              module_element: Element | None) -> PeripheralGroup:
+        '''Get the peripheral group for the given peripheral element using the given module
+        element to get the register definitions.
+
+        This is a private method. You should call 'get_peripheral_groups()' to get all the info
+        you will need for the device peripherals.
+        '''
+        return PeripheralGroup(name = sys.intern(_get_str(periph_element, 'name')),
+                               id = sys.intern(_get_str(periph_element, 'id')),
+                               version = sys.intern(_get_str(periph_element, 'version')),
+                               instances = AtdfReader._get_peripheral_instances(periph_element),
+                               reg_groups = AtdfReader._get_register_groups(module_element))
+
+
+    @staticmethod
+    def _get_peripheral_instances(module_element: Element) -> list[PeripheralInstance]:
         '''Get a list of peripheral instances for the peripheral referred to by the given Element.
 
         This is a private method. You should call 'get_peripheral_groups()' to get all the info
@@ -385,152 +794,191 @@ class AtdfReader:
         '''
         instances: list[PeripheralInstance] = []
 
-        for inst_element in module_element.findall('instance'):
-            inst_name: str = AtdfReader.get_str(inst_element, 'name')
+        for inst_element in module_element.iterfind('instance'):
+            inst_name: str = inst_element.get('name', '')
             inst_group_refs: list[RegisterGroupReference] = []
             inst_params: list[ParameterValue] = []
 
-            for group_element in inst_element.findall('register-group'):
-                rgr = RegisterGroupReference(instance_name = AtdfReader.get_str(group_element, 'name'),
-                                             module_name = AtdfReader.get_str(group_element, 'name-in-module'),
-                                             addr_space = AtdfReader.get_str(group_element, 'address-space'),
-                                             offset = AtdfReader.get_int(group_element, 'offset'))
-                inst_group_refs.append(rgr)
-
-            parameters: Element | None = inst_element.find('parameters')
-            if parameters is not None:
-                for param_element in parameters.findall('param'):
-                    pv = ParameterValue(name = AtdfReader.get_str(param_element, 'name'),
-                                        value = AtdfReader.get_str(param_element, 'value'),
-                                        caption = AtdfReader.get_str(param_element, 'caption'))
-                    inst_params.append(pv)
+            # Get the register groups and parameters in one pass over the instance's children
+            # instead of searching for each separately.
+            for child in inst_element:
+                if 'register-group' == child.tag:
+                    attrs = child.attrib
+                    rgr = RegisterGroupReference(instance_name = attrs.get('name', ''),
+                                                 module_name = sys.intern(attrs.get('name-in-module', '')),
+                                                 addr_space = sys.intern(attrs.get('address-space', '')),
+                                                 offset = _parse_int(attrs.get('offset')))
+                    inst_group_refs.append(rgr)
+                elif 'parameters' == child.tag:
+                    inst_params.extend(map(_get_parameter_value, child.iterfind('param')))
 
             instance = PeripheralInstance(name = inst_name,
                                           reg_group_refs = inst_group_refs,
-                                          params = inst_params)
+                                          params = tuple(inst_params))
             instances.append(instance)
 
         return instances
 
 
-    def _get_register_groups(self, periph_name: str) -> list[RegisterGroup]:
-        '''Get a list of register groups for the peripheral with the given name (ADC, CAN, etc.).
+    @staticmethod
+    def _get_register_groups(module_element: Element | None) -> list[RegisterGroup]:
+        '''Get a list of register groups for the peripheral defined by the given module element
+        from the "modules" section of the file.
 
         This is a private method. You should call 'get_peripheral_groups()' to get all the info
         you will need for the device peripherals.
-        '''        
-        # First find the module element corresponding to our desired peripheral.
-        start_element: Element | None = self.root.find(AtdfReader.modules_path)        
-        module_element: Element | None = self._find_element_with_name_attr(start_element,
-                                                                            'module',
-                                                                            periph_name)
+        '''
         if module_element is None:
             return []
 
         register_groups: list[RegisterGroup] = []
+        value_groups: dict[str, Element] = AtdfReader._index_by_name(module_element, 'value-group')
+
+        # Bitfields in a module often use the same value group, so make the values for each group
+        # once and share them. This is filled in as needed by _get_register_fields().
+        group_values: dict[str, tuple[ParameterValue, ...]] = {}
 
-        for group in module_element.findall('register-group'):
-            group_modes: list[str] = []
-            for mode_element in group.findall('mode'):
-                group_modes.append(AtdfReader.get_str(mode_element, 'name'))
+        for group in module_element.iterfind('register-group'):
+            group_modes = [sys.intern(_get_str(mode_element, 'name'))
+                           for mode_element in group.iterfind('mode')]
 
-            rg = RegisterGroup(name = AtdfReader.get_str(group, 'name'),
-                               caption = AtdfReader.get_str(group, 'caption'),
-                               size = AtdfReader.get_int(group, 'size'),
+            rg = RegisterGroup(name = _get_str(group, 'name'),
+                               caption = _get_str(group, 'caption'),
+                               size = _get_int(group, 'size'),
                                modes = group_modes,
-                               members = self._get_register_group_members(module_element, group))
+                               members = AtdfReader._get_register_group_members(value_groups,
+                                                                                group_values,
+                                                                                group))
             register_groups.append(rg)
 
         return register_groups
 
 
-    def _get_register_group_members(self,
-                                    module_element:Element,
+    @staticmethod
+    def _get_register_group_members(value_groups: dict[str, Element],
+                                    group_values: dict[str, tuple[ParameterValue, ...]],
                                     group_element: Element) -> list[RegisterGroupMember]:
         '''Get the members for the register group referred to by the given Element, which can be
         either a register definition or a reference to another group.
 
-        The peripheral module element is also needed because that is used when getting info about
-        the bitfields in the register.
+        The value groups of the peripheral module, indexed by name, are also needed because those
+        are used when getting info about the bitfields in the register. The values already made for
+        those groups are passed along to '_get_register_fields()'.
 
         This is a private method. You should call 'get_peripheral_groups()' to get all the info
         you will need for the device peripherals.
         '''
         group_members: list[RegisterGroupMember] = []
 
+        # These are called a lot in here, so bind them locally to save a lookup for each call.
+        intern = sys.intern
+        parse_int = _parse_int
+
         for member in group_element:
             if 'register-group' == member.tag:
                 # This group member is a reference to another group. This is used to add another
                 # layer of indirection to a set of registers. For example, the PORT peripheral on
                 # some parts uses this to denote an array of a group with one for each port.
 
+                attrs = member.attrib
                 ref = RegisterGroupMember(is_subgroup = True,
-                                          name = AtdfReader.get_str(member, 'name'),
-                                          module_name = AtdfReader.get_str(member, 'name-in-module'),
-                                          mode = AtdfReader.get_str(member, 'modes'),
-                                          offset = AtdfReader.get_int(member, 'offset'),
-                                          size = AtdfReader.get_int(member, 'size'),
-                                          count = AtdfReader.get_int(member, 'count'),
+                                          name = intern(attrs.get('name', '')),
+                                          module_name = intern(attrs.get('name-in-module', '')),
+                                          mode = intern(attrs.get('modes', '')),
+                                          offset = parse_int(attrs.get('offset')),
+                                          size = parse_int(attrs.get('size')),
+                                          count = parse_int(attrs.get('count')),
                                           init_val = 0,
-                                          caption = AtdfReader.get_str(member, 'caption'),
+                                          caption = attrs.get('caption', ''),
                                           fields = [])
                 group_members.append(ref)
             elif 'register' == member.tag:
                 # This group member is a register.
 
+                attrs = member.attrib
                 reg = RegisterGroupMember(is_subgroup = False,
-                                          name = AtdfReader.get_str(member, 'name'),
+                                          name = intern(attrs.get('name', '')),
                                           module_name = '',
-                                          mode = AtdfReader.get_str(member, 'modes'),
-                                          offset = AtdfReader.get_int(member, 'offset'),
-                                          size = AtdfReader.get_int(member, 'size'),
-                                          count = AtdfReader.get_int(member, 'count'),
-                                          init_val = AtdfReader.get_int(member, 'initval'),
-                                          caption = AtdfReader.get_str(member, 'caption'),
-                                          fields = self._get_register_fields(module_element, member))
+                                          mode = intern(attrs.get('modes', '')),
+                                          offset = parse_int(attrs.get('offset')),
+                                          size = parse_int(attrs.get('size')),
+                                          count = parse_int(attrs.get('count')),
+                                          init_val = parse_int(attrs.get('initval')),
+                                          caption = attrs.get('caption', ''),
+                                          fields = AtdfReader._get_register_fields(value_groups,
+                                                                                   group_values,
+                                                                                   member))
                 group_members.append(reg)
 
         return group_members
 
 
-    def _get_register_fields(self, module_element: Element, reg_element: Element) -> list[RegisterField]:
+    @staticmethod
+    def _get_register_fields(value_groups: dict[str, Element],
+                             group_values: dict[str, tuple[ParameterValue, ...]],
+                             reg_element: Element) -> list[RegisterField]:
         '''Get the definitions of the bitfields within the given register, including the list of
         possible values if that is provided.
 
-        The peripheral module of which the given register is a memeber is also needed to get the
-        list of possible values for the register if those are provided.
+        The value groups of the peripheral module of which the given register is a memeber, indexed
+        by name, are also needed to get the list of possible values for the register if those are
+        provided. The values made for each value group are saved by group name in 'group_values' so
+        that bitfields using the same group share them instead of each getting their own copies.
         
         This is a private method. You should call 'get_peripheral_groups()' to get all the info
         you will need for the device peripherals.
         '''
         reg_fields: list[RegisterField] = []
 
-        for field_element in reg_element.findall('bitfield'):
-            values_name: str | None = field_element.get('values')
-            values_list: list[ParameterValue] = []
+        # These are called a lot in here, so bind them locally to save a lookup for each call.
+        intern = sys.intern
+        parse_int = _parse_int
 
+        for field_element in reg_element.iterfind('bitfield'):
+            field_attrs = field_element.attrib
+            values_name: str | None = field_attrs.get('values')
+            field_values: tuple[ParameterValue, ...] = ()
+
+            # Like the modes below, most bitfields do not have values and so just use the shared
+            # empty tuple.
             if values_name is not None:
-                values_element: Element | None = self._find_element_with_name_attr(module_element,
-                                                                                   'value-group',
-                                                                                    values_name)
-
-                if values_element is not None:
-                    for val_element in values_element.findall('value'):
-                        val = ParameterValue(name = AtdfReader.get_str(val_element, 'name'),
-                                             value = AtdfReader.get_str(val_element, 'value'),
-                                             caption = AtdfReader.get_str(val_element, 'caption'))
-                        values_list.append(val)
-
-            field_modes_str = AtdfReader.get_str(field_element, 'modes')
-            field_modes: list[str] = []
+                saved_values = group_values.get(values_name)
+
+                if saved_values is None:
+                    values_element: Element | None = value_groups.get(values_name)
+
+                    if values_element is not None:
+                        saved_values = tuple(map(_get_parameter_value,
+                                                 values_element.iterfind('value')))
+                    else:
+                        saved_values = ()
+
+                    group_values[values_name] = saved_values
+
+                field_values = saved_values
+
+            # Most bitfields do not have modes either. An empty tuple is a shared singleton, so those
+            # fields do not need to allocate anything for this.
+            field_modes_str: str | None = field_attrs.get('modes')
+            field_modes: tuple[str, ...] = ()
             if field_modes_str:
-                field_modes = field_modes_str.split()
+                field_modes = tuple(map(intern, field_modes_str.split()))
 
-            rf = RegisterField(name = AtdfReader.get_str(field_element, 'name'),
-                               caption = AtdfReader.get_str(field_element, 'caption'),
-                               mask = AtdfReader.get_int(field_element, 'mask'),
+            # Work out the position and width of the field here so the file makers do not each
+            # need to.
+            field_mask = parse_int(field_attrs.get('mask'))
+
+            # The position trick returns -1 if the input is 0. This was found on Stack Overflow by
+            # searching online for "python ctz": https://stackoverflow.com/a/63552117.
+            field_lsb = (field_mask & -field_mask).bit_length() - 1
+
+            rf = RegisterField(name = intern(field_attrs.get('name', '')),
+                               caption = field_attrs.get('caption', ''),
+                               mask = field_mask,
+                               lsb = field_lsb,
+                               width = field_mask.bit_count(),
                                modes = field_modes,
-                               values = values_list)
+                               values = field_values)
             reg_fields.append(rf)
 
         return reg_fields
@@ -544,9 +992,53 @@ class AtdfReader:
         if start_element is None:
             return None
 
-        for subelement in start_element.findall(subelement_name):
+        return self._get_name_index(start_element, subelement_name).get(value)
+
+
+    def _get_name_index(self, start_element: Element, subelement_name: str) -> dict[str, Element]:
+        '''Return a dict of the subelements under the starting element by their 'name' attributes.
+
+        The dict is built the first time a particular starting element and subelement are used and
+        then saved, so later calls are cheap. If more than one subelement has the same name, the
+        first one is used.
+        '''
+        index: dict[str, Element] | None = self._name_index.get((start_element, subelement_name))
+
+        if index is None:
+            index = AtdfReader._index_by_name(start_element, subelement_name)
+            self._name_index[(start_element, subelement_name)] = index
+
+        return index
+
+
+    @staticmethod
+    def _index_by_name(start_element: Element, subelement_name: str) -> dict[str, Element]:
+        '''Return a new dict of the subelements under the starting element by their 'name'
+        attributes. If more than one subelement has the same name, the first one is used.
+
+        Use '_get_name_index()' instead if the same dict might be needed more than once.
+        '''
+        index: dict[str, Element] = {}
+
+        for subelement in start_element.iterfind(subelement_name):
             attr = subelement.get('name')
-            if attr is not None and attr == value:
-                return subelement
-            
-        return None
+            if attr is not None  and  attr not in index:
+                index[attr] = subelement
+
+        return index
+
+
+def _get_peripheral_group_from_xml(periph_xml: tuple[bytes, bytes | None]) -> PeripheralGroup:
+    '''Get the peripheral group for the given XML text of a peripheral element and the module
+    element that defines its registers.
+
+    This is what the worker processes run when AtdfReader parses peripherals in parallel. It has to
+    be a module-level function so the worker processes can find it.
+    '''
+    periph_element: Element = ET.fromstring(periph_xml[0])
+    module_element: Element | None = None
+
+    if periph_xml[1] is not None:
+        module_element = ET.fromstring(periph_xml[1])
+
+    return AtdfReader._get_peripheral_group(periph_element, module_element)
@@ -32,6 +32,10 @@ This is a big dataclass that will encapsulate all of the necessary information a
 was read from a device file. The device file class, like AtdfReader, will have methods to let you
 read these individual structures and one to read out everything into the big DeviceInfo structure.
 
+Devices can have many thousands of these structures, so they all use slots to keep them small. They
+are also frozen because nothing should need to change them after they are read from the file. A few
+of the simplest ones are NamedTuples instead, which are even smaller and quicker to create.
+
 This is a big structure, so here is a tree showing all of its members.
 
 name : str
@@ -39,28 +43,28 @@ cpu : str
 family : str
 series : str
 pincount : int
-parameters : list[ParameterValue]
+parameters : tuple[ParameterValue, ...]
     name : str
     value : str
     caption : str
-property_groups : list[PropertyGroup]
+property_groups : tuple[PropertyGroup, ...]
     name : str
-    properties : list[ParameterValue]
+    properties : tuple[ParameterValue, ...]
         name : str
         value : str
         caption : str
-address_spaces : list[DeviceAddressSpace]
+address_spaces : tuple[DeviceAddressSpace, ...]
     id : str
     start_addr : int
     size : int
-    mem_regions: list[DeviceMemoryRegion]
+    mem_regions: tuple[DeviceMemoryRegion, ...]
         name : str
         start_addr : int
         size : int
         type : str
         page_size : int
         external : bool
-peripherals : list[PeripheralGroup]
+peripherals : tuple[PeripheralGroup, ...]
     name : str
     id : str
     version : str
@@ -71,7 +75,7 @@ peripherals : list[PeripheralGroup]
             module_name : str
             addr_space : str
             offset : int
-        params : list[ParameterValue]
+        params : tuple[ParameterValue, ...]
             name : str
             value : str
             caption : str
@@ -94,30 +98,32 @@ peripherals : list[PeripheralGroup]
                 name : str
                 caption : str
                 mask : int
-                modes : list[str]
-                values : list[ParameterValue]
+                lsb : int
+                width : int
+                modes : tuple[str, ...]
+                values : tuple[ParameterValue, ...]
                     name : str
                     value : str
                     caption : str
-interrupts : list[DeviceInterrupt]
+interrupts : tuple[DeviceInterrupt, ...]
     name : str
     index : int
     module_instance : str
     caption : str
-event_generators : list[DeviceEvent]
+event_generators : tuple[DeviceEvent, ...]
     name : str
     index : int
     module_instance : str
-event_users : list[DeviceEvent]
+event_users : tuple[DeviceEvent, ...]
     name : str
     index : int
     module_instance : str
 '''
 
 from dataclasses import dataclass
+from typing import NamedTuple
 
-@dataclass
-class ParameterValue:
+class ParameterValue(NamedTuple):
     '''A simple data structue containing general info about a device or peripheral. These will
     usually end up being turned into C macros or enum values the user can reference. Many elements
     in this file consist of (name, value, caption), so this data structure is used for those.
@@ -127,8 +133,7 @@ class ParameterValue:
     caption: str        # This is a comment to explain the parameter
 
 
-@dataclass
-class DeviceMemoryRegion:
+class DeviceMemoryRegion(NamedTuple):
     '''A data structure to represent a region of memory in the device.
 
     Memory regions are inside of address spaces and define regions of the space that are actually
@@ -142,7 +147,7 @@ class DeviceMemoryRegion:
     external: bool      # Is this an external memory interface?
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DeviceAddressSpace:
     '''A data structure to represent an address space in a device, usually for memory vs fuses.
 
@@ -155,11 +160,10 @@ class DeviceAddressSpace:
     id: str
     start_addr: int
     size: int
-    mem_regions: list[DeviceMemoryRegion]
+    mem_regions: tuple[DeviceMemoryRegion, ...]
 
 
-@dataclass
-class RegisterGroupReference:
+class RegisterGroupReference(NamedTuple):
     '''A data structure to represent a reference to a register group.
 
     Peripheral instances have a list of register groups they use. The list has the name used for
@@ -173,7 +177,7 @@ class RegisterGroupReference:
     offset: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PeripheralInstance:
     '''A data structure to represent a single instance of a peripheral.
 
@@ -183,21 +187,23 @@ class PeripheralInstance:
     '''
     name: str           # "ADC0" vs "ADC1" and so on
     reg_group_refs: list[RegisterGroupReference]
-    params: list[ParameterValue]
+    params: tuple[ParameterValue, ...]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RegisterField:
     '''A data structure representing a single bitfield in a register.
     '''
     name: str
     caption: str
     mask: int
-    modes: list[str]
-    values: list[ParameterValue]    # Enum values for the possible values of this field
+    lsb: int            # Position of the lowest set bit in the mask or -1 if the mask is 0
+    width: int          # Number of bits set in the mask
+    modes: tuple[str, ...]
+    values: tuple[ParameterValue, ...]  # Enum values for the possible values of this field
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RegisterGroupMember:
     '''A data structure to represent a member of a register group.
     
@@ -216,7 +222,7 @@ class RegisterGroupMember:
     fields: list[RegisterField]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RegisterGroup:
     '''A data structure to represent a set of registers grouped together in a peripheral.
 
@@ -230,7 +236,7 @@ class RegisterGroup:
     members: list[RegisterGroupMember]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PeripheralGroup:
     '''A data structure to represent a group of peripherals of the same type.
     '''
@@ -241,8 +247,7 @@ class PeripheralGroup:
     reg_groups: list[RegisterGroup]
 
 
-@dataclass
-class DeviceInterrupt:
+class DeviceInterrupt(NamedTuple):
     '''A data structure to represent a single interrupt in a device.
     '''
     name: str
@@ -251,8 +256,7 @@ class DeviceInterrupt:
     caption: str
 
 
-@dataclass
-class DeviceEvent:
+class DeviceEvent(NamedTuple):
     '''A data structure to represent a single event generator or user in a device.
     '''
     name: str
@@ -260,17 +264,17 @@ class DeviceEvent:
     module_instance: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PropertyGroup:
     '''A data structure to represent a group of additional properties for a device provided by the
     XML file.
     '''
     name: str
-    properties: list[ParameterValue]
+    properties: tuple[ParameterValue, ...]
 
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DeviceInfo:
     '''The top-level structure for device information, this will contain all of the above structures
     within it.
@@ -280,10 +284,10 @@ class DeviceInfo:
     family: str
     series: str
     pincount: int
-    parameters: list[ParameterValue]
-    property_groups: list[PropertyGroup]
-    address_spaces: list[DeviceAddressSpace]
-    peripherals: list[PeripheralGroup]
-    interrupts: list[DeviceInterrupt]
-    event_generators: list[DeviceEvent]
-    event_users: list[DeviceEvent]
+    parameters: tuple[ParameterValue, ...]
+    property_groups: tuple[PropertyGroup, ...]
+    address_spaces: tuple[DeviceAddressSpace, ...]
+    peripherals: tuple[PeripheralGroup, ...]
+    interrupts: tuple[DeviceInterrupt, ...]
+    event_generators: tuple[DeviceEvent, ...]
+    event_users: tuple[DeviceEvent, ...]
@@ -39,15 +39,6 @@
 # One could use some code here to grab whatever is in this package directory, but for now there is
 # no harm in just explicity naming the modules. Notice that the ".py" extension is NOT included.
 
-from . import all_devices_header_maker
-from . import cortexm_c_device_header_maker
-from . import cortexm_c_periph_header_maker
-from . import cortexm_c_vectors_maker
-from . import cortexm_config_file_maker
-from . import cortexm_linker_script_maker
-from . import strings
-from . import version
-
 __all__ = [
     'all_devices_header_maker',
     'cortexm_c_device_header_maker',
@@ -58,3 +49,24 @@ __all__ = [
     'strings',
     'version'
 ]
+
+# The modules are not imported until something first asks for them. Python calls the __getattr__()
+# function below when it cannot find a name in this module, so that imports the module and stores
+# it here for later lookups to find right away. This way, just importing something like
+# "file_makers.strings" does not also load every file maker in here. Note that "from file_makers
+# import *" goes through __all__ and so still imports all of them.
+
+import importlib
+import types
+
+def __getattr__(name: str) -> types.ModuleType:
+    if name in __all__:
+        module = importlib.import_module('.' + name, __name__)
+        globals()[name] = module
+        return module
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -43,45 +43,52 @@ def run(hdr: IO[str], basename: str, device_families: dict[str, list[str]]) -> N
     The inputs are the file-like object to which the data will be written, the base
     name of the file without path or extension, and a dict of device families to lists of devices.
     ''' 
+    # Collect the pieces of the file here and write them all at once at the end.
+    parts: list[str] = []
+
     # Write the header block with copyright info.
-    hdr.write('/*\n')
-    hdr.write(strings.get_generated_by_string(' * '))
-    hdr.write(' * \n')
-    hdr.write(strings.get_non_cmsis_apache_license(' * '))
-    hdr.write(' */\n\n')
+    parts.append('/*\n')
+    parts.append(strings.get_generated_by_string(' * '))
+    parts.append(' * \n')
+    parts.append(strings.get_non_cmsis_apache_license(' * '))
+    parts.append(' */\n\n')
 
     # Include guard
-    hdr.write(f'#ifndef {basename.upper()}_H_\n')
-    hdr.write(f'#define {basename.upper()}_H_\n\n')
+    guard_name = basename.upper() + '_H_'
+    parts.append(f'#ifndef {guard_name}\n')
+    parts.append(f'#define {guard_name}\n\n')
 
+    # Sort the families and devices so the file comes out the same no matter what order the packs
+    # were found in.
     first_family = True
-    for family,devices in device_families.items():
+    for family in sorted(device_families):
         if first_family:
-            hdr.write(f'#if defined(__{family})\n')
+            parts.append(f'#if defined(__{family})\n')
         else:
-            hdr.write(f'#elif defined(__{family})\n')
+            parts.append(f'#elif defined(__{family})\n')
         
         first_family = False
 
-        first_dev = True
-        for d in devices:
-            name = d.upper()
+        # Get the upper- and lower-case names of the devices up front instead of in the loop.
+        device_names = [(d.upper(), d.lower()) for d in sorted(device_families[family])]
 
-            if first_dev: 
-                hdr.write(f'#  if defined(__{name}__)\n')
-            else:
-                hdr.write(f'#  elif defined(__{name}__)\n')
-            
+        # Each device gets its check and include in one piece.
+        first_dev = True
+        for name, header_name in device_names:
+            directive = 'if' if first_dev else 'elif'
             first_dev = False
 
-            hdr.write(f'#    include "proc/{d.lower()}.h"\n')
+            parts.append(f'#  {directive} defined(__{name}__)\n'
+                         f'#    include "proc/{header_name}.h"\n')
         
-        hdr.write('#  else\n')
-        hdr.write(f'#    error Unknown device for {family} family!\n')
-        hdr.write('#  endif\n')
+        parts.append(f'#  else\n'
+                     f'#    error Unknown device for {family} family!\n'
+                     f'#  endif\n')
+
+    parts.append('#else\n'
+                 '#  error Unknown device family!\n'
+                 '#endif\n')
 
-    hdr.write('#else\n')
-    hdr.write('#  error Unknown device family!\n')
-    hdr.write('#endif\n')
+    parts.append(f'\n#endif /* ifndef {guard_name} */\n')
 
-    hdr.write(f'\n#endif /* ifndef {basename.upper()}_H_ */\n')
+    hdr.write(''.join(parts))
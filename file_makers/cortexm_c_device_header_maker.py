@@ -133,7 +133,7 @@ def _get_file_prologue(devname: str) -> str:
     return prologue
 
 
-def _get_interrupt_enum(interrupts: list[DeviceInterrupt]) -> str:
+def _get_interrupt_enum(interrupts: tuple[DeviceInterrupt, ...]) -> str:
     '''Return a string containing a C enumerations for the device interrupts.
     '''
     enum_str: str = 'typedef enum IRQn\n{\n'
@@ -151,7 +151,7 @@ def _get_interrupt_enum(interrupts: list[DeviceInterrupt]) -> str:
             '#endif /* ifndef __ASSEMBLER__ */\n')
 
 
-def _get_parameter_macros(parameters: list[ParameterValue], prefix: str = '') -> str:
+def _get_parameter_macros(parameters: tuple[ParameterValue, ...], prefix: str = '') -> str:
     '''Return a string containing C macros defining the given parameters and their values.
     '''
     macros: str = ''
@@ -168,7 +168,7 @@ def _get_parameter_macros(parameters: list[ParameterValue], prefix: str = '') ->
     return macros
 
 
-def _get_memory_region_macros(address_spaces: list[DeviceAddressSpace]) -> str:
+def _get_memory_region_macros(address_spaces: tuple[DeviceAddressSpace, ...]) -> str:
     '''Return a string containing C macros defining the locations and sizes of the memory regions
     on the device.
     '''
@@ -191,7 +191,7 @@ def _get_memory_region_macros(address_spaces: list[DeviceAddressSpace]) -> str:
     return region_str
 
 
-def _get_peripheral_headers(peripherals: list[PeripheralGroup], prefix: str) -> str:
+def _get_peripheral_headers(peripherals: tuple[PeripheralGroup, ...], prefix: str) -> str:
     '''Return a string containing include declarations for this devices' peripherals, not including
     device fuses or core peripherals.
 
@@ -209,8 +209,8 @@ def _get_peripheral_headers(peripherals: list[PeripheralGroup], prefix: str) ->
     return periph_str
 
 
-def _get_peripheral_address_macros(peripherals: list[PeripheralGroup], 
-                                   address_spaces: list[DeviceAddressSpace]) -> str:
+def _get_peripheral_address_macros(peripherals: tuple[PeripheralGroup, ...], 
+                                   address_spaces: tuple[DeviceAddressSpace, ...]) -> str:
     '''Return a string containing macros that define the location of peripheral instances on the
     device.
 
@@ -242,7 +242,7 @@ def _get_peripheral_address_macros(peripherals: list[PeripheralGroup],
 
 
 def _get_device_fuse_declarations(fuse_periph: PeripheralGroup, 
-                                  addr_spaces: list[DeviceAddressSpace]
+                                  addr_spaces: tuple[DeviceAddressSpace, ...]
                                  ) -> str:
     '''Return a string of declarations for the given periepheral group assuming the group represents
     a set of device fuses.
@@ -311,7 +311,7 @@ def _peripheral_is_special(periph: PeripheralGroup) -> bool:
     return False
 
 
-def _find_start_of_address_space(addr_spaces: list[DeviceAddressSpace], name: str) -> int:
+def _find_start_of_address_space(addr_spaces: tuple[DeviceAddressSpace, ...], name: str) -> int:
     '''Search the list of address spaces for the one with the given name and return its start
     address.
     '''
@@ -145,10 +145,10 @@ def _get_register_macros(periph_name: str, reg: RegisterGroupMember) -> str:
         if field.modes:
             for fmode in field.modes:
                 field_macro_name = f'{macro_base_name}_{fmode}_{field.name}'
-                macros += _get_bitfield_macros(field_macro_name, field.mask, field.caption)
+                macros += _get_bitfield_macros(field_macro_name, field)
         else:
             field_macro_name = f'{macro_base_name}_{field.name}'
-            macros += _get_bitfield_macros(field_macro_name, field.mask, field.caption)
+            macros += _get_bitfield_macros(field_macro_name, field)
 
         if field.values:
             value_macro_base = f'{macro_base_name}_{field.name}'
@@ -201,7 +201,7 @@ def _get_file_epilogue(filename: str) -> str:
     return epilogue
 
 
-def _get_bitfield_macros(field_macro_name: str, mask: int, caption: str) -> str:
+def _get_bitfield_macros(field_macro_name: str, field: RegisterField) -> str:
     '''Return a string containing set of macros based on the given base name that define a mask,
     position, and a way to set a value for this field.
     '''
@@ -210,19 +210,15 @@ def _get_bitfield_macros(field_macro_name: str, mask: int, caption: str) -> str:
     msk_macro_name = f'{field_macro_name}_Msk'
     pos_macro_name = f'{field_macro_name}_Pos'
 
-    # This returns -1 if the input is 0. This was found on Stack Overflow by searching online for
-    # "python ctz": https://stackoverflow.com/a/63552117.
-    pos = (mask & -mask).bit_length() - 1
-
-    macros += _get_basic_macro(msk_macro_name, f'0x{mask :08X}ul', caption)
-    macros += _get_basic_macro(pos_macro_name, f'{pos}ul')
+    macros += _get_basic_macro(msk_macro_name, f'0x{field.mask :08X}ul', field.caption)
+    macros += _get_basic_macro(pos_macro_name, f'{field.lsb}ul')
     macros += _get_basic_macro(f'{field_macro_name}(v)',
                                f'{msk_macro_name} & ((uint32_t)(v) << {pos_macro_name})')
 
     return macros
 
 
-def _get_bitfield_value_macros(macro_base_name: str, values: list[ParameterValue]) -> str:
+def _get_bitfield_value_macros(macro_base_name: str, values: tuple[ParameterValue, ...]) -> str:
     '''Return a string containing macros for each value in the given list: one macro defining the
     value and another convenience macro to assign this value to a register.
     '''
@@ -39,7 +39,7 @@ import textwrap
 from typing import IO
 
 
-def run(proc_header_name: str, interrupts: list[DeviceInterrupt], outfile: IO[str]) -> None:
+def run(proc_header_name: str, interrupts: tuple[DeviceInterrupt, ...], outfile: IO[str]) -> None:
     '''Make a C vector definition file for the given device assuming it is a PIC or SAM Cortex-M
     device.
 
@@ -123,7 +123,7 @@ def _get_default_handlers() -> str:
         ''')
 
 
-def _get_handler_declarations(interrupts: list[DeviceInterrupt]) -> str:
+def _get_handler_declarations(interrupts: tuple[DeviceInterrupt, ...]) -> str:
     '''Return a string containing weak declarations for the interrupt and exception handlers not
     already covered by _get_default_handlers().
 
@@ -144,7 +144,7 @@ def _get_handler_declarations(interrupts: list[DeviceInterrupt]) -> str:
     return decl_str
 
 
-def _get_vector_table(interrupts: list[DeviceInterrupt]) -> str:
+def _get_vector_table(interrupts: tuple[DeviceInterrupt, ...]) -> str:
     '''Return a string containing the definition of the vector table for this device.
 
     The vector table is an array of function pointers, but the very first entry is the initial top
@@ -52,11 +52,6 @@ def run(devinfo: DeviceInfo, outfile: IO[str]) -> None:
     
     unique_addr_spaces: list[DeviceAddressSpace] = _remove_overlapping_memory(devinfo.address_spaces)
 
-    # Sort the now-not-overlapping memory regions by starting address.
-    # See https://docs.python.org/3/howto/sorting.html
-    for addr_space in unique_addr_spaces:
-        addr_space.mem_regions.sort(key=operator.attrgetter('start_addr'))
-
     # Now we can output the actual linker script bits.
     outfile.write(_get_memory_symbols(unique_addr_spaces))
     outfile.write('\n\n')
@@ -79,8 +74,9 @@ def run(devinfo: DeviceInfo, outfile: IO[str]) -> None:
     outfile.write('}\n')
 
 
-def _remove_overlapping_memory(address_spaces: list[DeviceAddressSpace]) -> list[DeviceAddressSpace]:
-    '''Return a list of address spaces with overlapping regions removed.
+def _remove_overlapping_memory(address_spaces: tuple[DeviceAddressSpace, ...]) -> list[DeviceAddressSpace]:
+    '''Return a list of address spaces with overlapping regions removed and the remaining regions
+    sorted by starting address.
 
     Some devices, like the SAME54 series, have multiple regions with the same starting address. We
     don't want those in our linker script because they will produce linker errors, so we need to 
@@ -118,10 +114,14 @@ def _remove_overlapping_memory(address_spaces: list[DeviceAddressSpace]) -> list
             if region.name not in regions_to_remove:
                 new_regions.append(region)
 
+        # Sort the now-not-overlapping memory regions by starting address.
+        # See https://docs.python.org/3/howto/sorting.html
+        new_regions.sort(key=operator.attrgetter('start_addr'))
+
         new_spaces.append(DeviceAddressSpace(id = addr_space.id,
                                              start_addr = addr_space.start_addr,
                                              size = addr_space.size,
-                                             mem_regions = new_regions))
+                                             mem_regions = tuple(new_regions)))
         
     return new_spaces
 
@@ -52,25 +52,33 @@
 # requirements. This code, presumably like Microchip's/Atmel's code, uses Arm CMSIS 6 as a template
 # and so there will probably be a lot of similarities because of that.
 #
-# This project uses the default XML parsers in Python, which are vulnerable to certain attacks
-# relying on XML entities referecing other entities multiple times. Specifically, the attacks are
-# called "Billion Laughs" and "Quadratic Blowup". Therefore, you should ensure that the packs files
-# you give to this module are really from Microchip and not some malicious user. See the info here:
+# This project uses lxml to parse the device files if it is installed. Otherwise, it uses the
+# default XML parsers in Python, which are vulnerable to certain attacks relying on XML entities
+# referecing other entities multiple times. Specifically, the attacks are called "Billion Laughs"
+# and "Quadratic Blowup". Therefore, you should ensure that the packs files you give to this module
+# are really from Microchip and not some malicious user. See the info here:
 # https://docs.python.org/3/library/xml.html#module-xml. That page has a link to a package called
 # "defusedxml" you can use if you want to be safer. You should just need to get it from PIP and
-# update the import statement for ElementTree below and in other modules to use it.
+# update the import statement for ElementTree in atdf_reader.py to use it.
 #
 
 import argparse
 from atdf_reader import AtdfReader
 from device_info import DeviceInfo, PeripheralGroup
 from file_makers import *
+import functools
 import multiprocessing
 import os
 from pathlib import Path
 import shutil
 
 
+# The names of the directories in which the peripheral and fuse headers are put. These are
+# subdirectories of the directory in which the device headers are put.
+PERIPHERAL_HEADER_PATHNAME = 'periph'
+FUSES_HEADER_PATHNAME = 'fuses'
+
+
 def get_atdf_paths_from_dir(packs_dir: str) -> list[Path]:
     '''Return a list of Path objects in which each Path points to a file with the '.atdf' extension.
     '''
@@ -99,22 +107,99 @@ def get_atdf_paths_from_dir(packs_dir: str) -> list[Path]:
     return list(atdf_paths.values())
 
 
-def parse_atdf_file_at_path(atdf_path: Path) -> DeviceInfo:
+def parse_atdf_file_at_path(atdf_path: Path, cache_dir: Path | None = None) -> DeviceInfo:
     '''Open a single .atdf file and parse it into a DeviceInfo structure.
+
+    If 'cache_dir' is given, then the DeviceInfo is loaded from there if the file was already parsed
+    and has not changed since.
     '''
-    print(f'Parsing file {atdf_path}', flush=True)
-    return AtdfReader(atdf_path).get_all_device_info()
+    reader = AtdfReader(atdf_path, cache_dir=cache_dir)
 
+    if reader.is_cached():
+        print(f'Loaded file {atdf_path} from the cache', flush=True)
+    else:
+        print(f'Parsing file {atdf_path}', flush=True)
 
-def get_device_infos_from_atdf_paths(atdf_paths: list[Path], jobs: int = 0) -> list[DeviceInfo]:
-    '''Parse all of the ATDF files in the list and return corresponding DeviceInfo structures.
+    return reader.get_all_device_info()
 
-    This will skip over unsupported architectures and so the output list might have fewer elements
-    than the input list. Use 'jobs' to control how many processes this spawns. The default is to
-    spawn one per process CPU (as returned by os.cpu_count()).
+
+def make_device_files_from_atdf_path(atdf_path: Path, output_dir: Path,
+                                     cache_dir: Path | None = None) -> DeviceInfo | None:
+    '''Parse a single .atdf file and make the files specific to that device in 'output_dir'.
+
+    This returns the parsed DeviceInfo so that the caller can make the files shared among devices,
+    like the peripheral headers. Files are made only for Cortex-M devices, so this returns None for
+    any other device.
     '''
-    devinfos: list[DeviceInfo] = []
+    devinfo = parse_atdf_file_at_path(atdf_path, cache_dir)
+
+    if not devinfo.cpu.startswith('cortex-m'):
+        return None
+
+    print(f'Creating files for device {devinfo.name} ({devinfo.cpu})', flush=True)
+
+    lib_proc_prefix = output_dir / 'cortex-m' / 'proc'
+    include_proc_prefix = output_dir / 'cortex-m' / 'include' / 'proc'
+
+    # Linker script
+    #
+    ld_path = lib_proc_prefix / devinfo.name.lower() / 'default.ld'
+    with open_for_writing(ld_path) as ld:
+        cortexm_linker_script_maker.run(devinfo, ld)
+
+    # C device-specifc header file
+    #
+    dev_header_path = include_proc_prefix / (devinfo.name.lower() + '.h')
+    with open_for_writing(dev_header_path) as hdr:
+        cortexm_c_device_header_maker.run(devinfo, hdr, PERIPHERAL_HEADER_PATHNAME,
+                                          FUSES_HEADER_PATHNAME)
+
+    # Device fuses are a special peripheral, so look for those and make their header here. Assume
+    # each device has at most one fuse peripheral called FUSES for now. You can find the special
+    # handling this app does for fuses by searching for 'fuses' with the single quotes.
+    #
+    for periph in devinfo.peripherals:
+        if 'fuses' == periph.name.lower():
+            fuses_header_path = (include_proc_prefix / FUSES_HEADER_PATHNAME / (devinfo.name.lower() + '.h'))
+            with open_for_writing(fuses_header_path) as hdr:
+                basename = devinfo.name.lower() + '_fuses'
+                cortexm_c_periph_header_maker.run(basename, periph, hdr)
+
+    # C interrupt vectors file
+    #
+    vectors_src_path = lib_proc_prefix / devinfo.name.lower() / 'vectors.c'
+    with open_for_writing(vectors_src_path) as vec:
+        proc_header_name = 'which_pic32.h'
+        cortexm_c_vectors_maker.run(proc_header_name, devinfo.interrupts, vec)
+
+    # Clang configuration file
+    #
+    config_path = output_dir / 'config' / (devinfo.name.lower() + '.cfg')
+    with open_for_writing(config_path) as cfg:
+        default_ld_path = os.path.relpath(ld_path, config_path.parent)
+        cortexm_config_file_maker.run(devinfo, cfg, default_ld_path)
+
+    return devinfo
+
+
+def make_peripheral_header(periph_name: str, periph_group: PeripheralGroup,
+                           output_dir: Path) -> None:
+    '''Make the C header for a single peripheral shared among devices in 'output_dir'.
+    '''
+    print(f'Creating peripheral header for {periph_name}', flush=True)
+
+    include_proc_prefix = output_dir / 'cortex-m' / 'include' / 'proc'
+    periph_header_path = include_proc_prefix / PERIPHERAL_HEADER_PATHNAME / (periph_name + '.h')
+    with open_for_writing(periph_header_path) as hdr:
+        cortexm_c_periph_header_maker.run(periph_name, periph_group, hdr)
+
+
+def get_job_count(jobs: int = 0) -> int:
+    '''Return how many processes to spawn given the number requested in 'jobs'.
 
+    The default is to spawn one per process CPU (as returned by os.cpu_count()), which is also the
+    most this will allow.
+    '''
     max_jobs: int | None = os.cpu_count()
 
     # Pick a reasonable default if the number of CPUs cannot be determined.
@@ -124,10 +209,28 @@ def get_device_infos_from_atdf_paths(atdf_paths: list[Path], jobs: int = 0) -> l
     if jobs <= 0  or  jobs > max_jobs:
         jobs = max_jobs
 
-    with multiprocessing.Pool(processes=jobs) as pool:
-        devinfos = pool.map(parse_atdf_file_at_path, atdf_paths, chunksize=6)
+    return jobs
+
+
+def parse_and_make_device_files(atdf_paths: list[Path], output_dir: Path, jobs: int = 0,
+                                cache_dir: Path | None = None) -> list[DeviceInfo]:
+    '''Parse all of the ATDF files in the list, make the files specific to each device in
+    'output_dir', and return the DeviceInfo structures of those devices.
+
+    This will skip over unsupported architectures and so the output list might have fewer elements
+    than the input list. Use 'jobs' to control how many processes this spawns. The default is to
+    spawn one per process CPU (as returned by os.cpu_count()). Use 'cache_dir' to save the parsed
+    info so that unchanged files do not need to be parsed again the next time. See
+    make_device_files_from_atdf_path() for more info.
+    '''
+    devinfos: list[DeviceInfo | None] = []
+
+    with multiprocessing.Pool(processes=get_job_count(jobs)) as pool:
+        make_func = functools.partial(make_device_files_from_atdf_path, output_dir=output_dir,
+                                      cache_dir=cache_dir)
+        devinfos = pool.map(make_func, atdf_paths, chunksize=6)
 
-    return devinfos
+    return [devinfo for devinfo in devinfos if devinfo is not None]
 
 
 def open_for_writing(outfile: Path):
@@ -219,7 +322,9 @@ def get_command_line_arguments() -> argparse.Namespace:
     parser.add_argument('--output-dir', type=Path, default=Path(os.getcwd()), metavar='DIR',
                         help='where to put the created device files (default is current working dir)')
     parser.add_argument('--parse-jobs', type=int, default=0, metavar='JOBS',
-                        help='how many processes to use for parsing device files (default is one per CPU)')
+                        help='how many processes to use for parsing and making device files (default is one per CPU)')
+    parser.add_argument('--cache-dir', type=Path, default=None, metavar='DIR',
+                        help='where to save parsed device info to speed up later runs (default is no cache)')
     parser.add_argument('--version', action='version',
                         version=version_str)
 
@@ -238,73 +343,31 @@ if '__main__' == __name__:
     if os.path.exists(args.output_dir):
         shutil.rmtree(args.output_dir)
 
-    lib_proc_prefix = args.output_dir / 'cortex-m' / 'proc'
-    include_proc_prefix = args.output_dir / 'cortex-m' / 'include' / 'proc'
-
-    peripheral_header_pathname = 'periph'
-    fuses_header_pathname = 'fuses'
-
     peripherals_to_make: dict[str, PeripheralGroup] = {}
     device_families: dict[str, list[str]] = {}
 
+    # The files specific to each device are made by the same processes that parse the device
+    # files, so the devices are handled in parallel.
     atdf_paths = get_atdf_paths_from_dir(args.packs_dir)
-    devinfo_list = get_device_infos_from_atdf_paths(atdf_paths, args.parse_jobs)
+    devinfo_list = parse_and_make_device_files(atdf_paths, args.output_dir, args.parse_jobs,
+                                               args.cache_dir)
 
-    # Make the files specific to each device and collect their perpiherals so we can make
-    # those later. 
+    # Collect the perpiherals of each device so we can make those next. 
     for devinfo in devinfo_list:
-        if not devinfo.cpu.startswith('cortex-m'):
-            continue
-
-        print(f'Creating files for device {devinfo.name} ({devinfo.cpu})')
-
-        # Linker script
-        #
-        ld_path = lib_proc_prefix / devinfo.name.lower() / 'default.ld'
-        with open_for_writing(ld_path) as ld:
-            cortexm_linker_script_maker.run(devinfo, ld)
-
-        # C device-specifc header file
-        #
-        dev_header_path = include_proc_prefix / (devinfo.name.lower() + '.h')
-        with open_for_writing(dev_header_path) as hdr:
-            cortexm_c_device_header_maker.run(devinfo, hdr, peripheral_header_pathname, 
-                                              fuses_header_pathname)
-
         # Make a dict of peripherals we need to make. Doing this ensures we make each unique
         # peripheral only once. We do not need to make core peripherals because they are already
-        # defined in CMSIS headers.
-        #
-        # Device fuses are a special peripheral, so look for those and handle them here. Assume
-        # each device has at most one fuse peripheral called FUSES for now. You can find the special
-        # handling this app does for fuses by searching for 'fuses' with the single quotes.
+        # defined in CMSIS headers. The fuses were already handled with the device files.
         #
         for periph in devinfo.peripherals:
             if 'fuses' == periph.name.lower():
-                fuses_header_path = (include_proc_prefix / fuses_header_pathname / (devinfo.name.lower() + '.h'))
-                with open_for_writing(fuses_header_path) as hdr:
-                    basename = devinfo.name.lower() + '_fuses'
-                    cortexm_c_periph_header_maker.run(basename, periph, hdr)
-            elif periph.id  and  'system_ip' not in periph.id.lower():
+                continue
+
+            if periph.id  and  'system_ip' not in periph.id.lower():
                 full_name = periph.name.lower() + '_' + periph.id.lower()
 
                 if full_name not in peripherals_to_make:
                     peripherals_to_make[full_name] = periph
 
-        # C interrupt vectors file
-        #
-        vectors_src_path = lib_proc_prefix / devinfo.name.lower() / 'vectors.c'
-        with open_for_writing(vectors_src_path) as vec:
-            proc_header_name = 'which_pic32.h'
-            cortexm_c_vectors_maker.run(proc_header_name, devinfo.interrupts, vec)
-
-        # Clang configuration file
-        #
-        config_path = args.output_dir / 'config' / (devinfo.name.lower() + '.cfg')
-        with open_for_writing(config_path) as cfg:
-            default_ld_path = os.path.relpath(ld_path, config_path.parent)
-            cortexm_config_file_maker.run(devinfo, cfg, default_ld_path)
-
         # Gather device names and families we can use to make an all-encompassing processor header
         # file. That is, instead of including the individual processor header in your project, you
         # can be lazy and include this one to let it figure out what processor you have. Family
@@ -324,12 +387,10 @@ if '__main__' == __name__:
 
     # Make all of the peripheral implementation C headers. These are shared among various devices.
     #
-    for periph_name, periph_group in peripherals_to_make.items():
-        print(f'Creating peripheral header for {periph_name}')
-
-        periph_header_path = include_proc_prefix / peripheral_header_pathname / (periph_name + '.h')
-        with open_for_writing(periph_header_path) as hdr:
-            cortexm_c_periph_header_maker.run(periph_name, periph_group, hdr)
+    with multiprocessing.Pool(processes=get_job_count(args.parse_jobs)) as pool:
+        pool.starmap(make_peripheral_header,
+                     [(periph_name, periph_group, args.output_dir)
+                      for periph_name, periph_group in peripherals_to_make.items()])
 
     # Make the all-encompassing processor header file.
     #